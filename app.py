@@ -1,12 +1,37 @@
 # app.py
 import streamlit as st
 import pandas as pd
+import pyarrow as pa
 import os
 from src.loaders import load_data
+from src.caching import frame_fingerprint
+from src.profiler import dtype_kinds
+from src.frame_utils import NUMERIC_KINDS
+from src import fast_stats
 
 st.set_page_config(page_title="Data Intelligence Hub", layout="wide")
 SAMPLES_DIR = "data/samples"
 
+def activate_dataset(df, filename, source_key):
+    """
+    Stores a newly loaded dataset plus the stats derived from it once per load,
+    so reruns triggered by widgets don't rescan the frame.
+    """
+    st.session_state['df'] = df
+    st.session_state['filename'] = filename
+    st.session_state['source_key'] = source_key
+    # Cache key for the Audit page's analyzers: hashing the frame once here
+    # keeps their cache hits free on every rerun
+    st.session_state['fingerprint'] = frame_fingerprint(df)
+    st.session_state['null_counts'] = fast_stats.null_counts(df, st.session_state.get('use_polars', False))
+    st.session_state['dtype_kinds'] = dtype_kinds(df)
+    try:
+        # Convert the preview to Arrow once instead of on every rerun
+        st.session_state['preview_arrow'] = pa.Table.from_pandas(df.head(3), preserve_index=False)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        # Mixed-type object columns: leave the coercion to Streamlit
+        st.session_state['preview_arrow'] = df.head(3)
+
 st.title("Data Intelligence Hub")
 
 # --- SIDEBAR (Keep existing logic) ---
@@ -16,13 +41,15 @@ with st.sidebar:
     
     df = None
     filename = None
+    source_key = None
     
     if mode == "Upload File":
         uploaded_file = st.file_uploader("Upload CSV or Excel", type=['csv', 'xlsx'])
-        if uploaded_file:
+        if uploaded_file and st.session_state.get('source_key') != uploaded_file.file_id:
             try:
                 df = load_data(uploaded_file, uploaded_file.name)
                 filename = uploaded_file.name
+                source_key = uploaded_file.file_id
             except Exception as e:
                 st.error(f"Error: {e}")
                 
@@ -33,12 +60,22 @@ with st.sidebar:
         if available_files:
             selected_sample = st.selectbox("Select a Sample", available_files)
             if selected_sample:
-                df = load_data(os.path.join(SAMPLES_DIR, selected_sample), selected_sample)
-                filename = selected_sample
+                sample_path = os.path.join(SAMPLES_DIR, selected_sample)
+                source_key = (sample_path, os.path.getmtime(sample_path))
+                if st.session_state.get('source_key') != source_key:
+                    df = load_data(sample_path, selected_sample)
+                    filename = selected_sample
+
+    # Plain session key (not a widget key) so the Audit page can read it
+    st.session_state['use_polars'] = st.toggle(
+        "Polars fast-path",
+        value=st.session_state.get('use_polars', fast_stats.HAS_POLARS),
+        disabled=not fast_stats.HAS_POLARS,
+        help="Multi-threaded column statistics (requires polars)."
+    )
 
     if df is not None:
-        st.session_state['df'] = df
-        st.session_state['filename'] = filename
+        activate_dataset(df, filename, source_key)
 
 # --- MAIN SCREEN SNAPSHOT ---
 if st.session_state.get('df') is not None:
@@ -57,14 +94,14 @@ if st.session_state.get('df') is not None:
         c1.metric("Rows", df.shape[0])
         c2.metric("Columns", df.shape[1])
         
-        # Calculate Missing %
+        # Calculate Missing % (from the per-load null counts)
         total_cells = df.size
-        missing_cells = df.isnull().sum().sum()
+        missing_cells = int(st.session_state['null_counts'].sum())
         missing_pct = (missing_cells / total_cells) * 100
         c3.metric("Global Missingness", f"{missing_pct:.1f}%")
         
         # Calculate Type Dominance
-        numeric_cols = len(df.select_dtypes(include='number').columns)
+        numeric_cols = sum(k in NUMERIC_KINDS for k in st.session_state['dtype_kinds'].values())
         c4.metric("Numeric Columns", f"{numeric_cols} / {df.shape[1]}")
 
         # Row 2: Type Breakdown & Head
@@ -72,11 +109,11 @@ if st.session_state.get('df') is not None:
         
         with col_types:
             st.markdown("**Column Types:**")
-            st.write(df.dtypes.value_counts())
+            st.write(df.dtypes.astype(str).value_counts()) # ArrowDtype objects don't serialize
             
         with col_head:
             st.markdown("**Preview (First 3 Rows):**")
-            st.dataframe(df.head(3), use_container_width=True, hide_index=True)
+            st.dataframe(st.session_state['preview_arrow'], use_container_width=True, hide_index=True)
 
     st.info("👈 Use the sidebar navigation to access the **Audit Dashboard** or **Data Bridge**.")
 
@@ -6,10 +6,14 @@ import altair as alt
 from src.profiler import generate_profile
 from src.outliers import detect_anomalies
 from src.scorer import calculate_readiness_score, assess_model_suitability
+from src.audit_context import build_audit_context
 
 
 st.set_page_config(page_title="Audit Dashboard", layout="wide")
 
+# Altair embeds chart data in the spec sent to the browser, so cap it
+MAX_PLOT_POINTS = 5000
+
 if 'df' not in st.session_state or st.session_state['df'] is None:
     st.warning("Please upload a dataset on the Home Page first.")
     st.stop()
@@ -18,14 +22,21 @@ df = st.session_state['df']
 
 st.title(f"📊 Audit Report: {st.session_state.get('filename', 'Dataset')}")
 
+# --- ANALYSIS: computed once per run, outside the tabs (cached per DataFrame) ---
+use_polars = st.session_state.get('use_polars', False)
+fp = st.session_state.get('fingerprint') # Computed once per load on the Home Page
+ctx = build_audit_context(df, use_polars, fingerprint=fp) # Shared numeric matrix, null and duplicate counts
+score_data = calculate_readiness_score(df, ctx, fingerprint=fp)
+profile = generate_profile(df, use_polars, fingerprint=fp)
+model_report = assess_model_suitability(df, ctx, fingerprint=fp)
+
 # --- SECTION 1: THE SCORECARD (Top Level) ---
-score_data = calculate_readiness_score(df)
 
 col1, col2, col3, col4 = st.columns(4)
 col1.metric("ML Readiness", f"{score_data['score']}/100", delta=score_data['grade'])
 col2.metric("Rows", df.shape[0])
 col3.metric("Columns", df.shape[1])
-col4.metric("Duplicates", df.duplicated().sum())
+col4.metric("Duplicates", ctx.dup_count)
 
 if score_data['penalties']:
     with st.expander("📉 Why did I lose points?"):
@@ -38,7 +49,6 @@ tab_profile, tab_outliers, tab_stats = st.tabs(["📋 Schema Profile", "⚠️ O
 # --- TAB 1: SCHEMA PROFILE ---
 with tab_profile:
     st.caption("Detailed breakdown of every column's health.")
-    profile = generate_profile(df)
     
     # Convert dict to DF for display
     profile_df = pd.DataFrame.from_dict(profile, orient='index').reset_index()
@@ -51,7 +61,6 @@ with tab_profile:
     )
 
     st.subheader("🧠 Machine Learning Suitability")
-    model_report = assess_model_suitability(df)
 
     tabs = st.tabs(model_report.keys())
 
@@ -73,7 +82,7 @@ with tab_outliers:
     
     if st.button("Run Advanced Outlier Detection"):
         with st.spinner("Training Isolation Forest..."):
-            outlier_report = detect_anomalies(df)
+            outlier_report = detect_anomalies(df, ctx, fingerprint=fp)
             
         # Summary Metrics
         c1, c2 = st.columns(2)
@@ -85,9 +94,19 @@ with tab_outliers:
             st.subheader("Anomaly Visualization")
             
             # Create a subset with a label
-            viz_df = df.select_dtypes(include='number').copy()
+            viz_df = df[ctx.numeric_cols].copy()
             viz_df['Status'] = 'Normal'
             viz_df.loc[outlier_report['ml_indices'], 'Status'] = 'Anomaly'
+
+            # Downsample large frames, keeping anomalies ahead of normal points
+            if len(viz_df) > MAX_PLOT_POINTS:
+                is_anomaly = viz_df['Status'] == 'Anomaly'
+                anoms = viz_df[is_anomaly]
+                anoms = anoms.sample(n=min(len(anoms), MAX_PLOT_POINTS), random_state=0)
+                normals = viz_df[~is_anomaly]
+                normals = normals.sample(n=min(len(normals), MAX_PLOT_POINTS - len(anoms)), random_state=0)
+                viz_df = pd.concat([anoms, normals])
+                st.caption(f"Plotting a sample of {len(viz_df):,} rows ({len(anoms):,} anomalies).")
             
             # Scatter plot of the first two numeric columns (Simple Projection)
             if viz_df.shape[1] >= 3: # Need at least 2 numeric + status
@@ -104,13 +123,13 @@ with tab_outliers:
                 
             # Show the actual bad rows
             st.subheader("Inspect Flagged Rows")
-            st.dataframe(df.iloc[outlier_report['ml_indices']].head(50))
+            # Slice the labels first so only 50 rows are materialized
+            st.dataframe(df.loc[outlier_report['ml_indices'][:50]])
 
 # --- TAB 3: DISTRIBUTIONS ---
 with tab_stats:
-    numeric_cols = df.select_dtypes(include='number').columns
-    if len(numeric_cols) > 0:
-        target_col = st.selectbox("Visualize Distribution", numeric_cols)
+    if len(ctx.numeric_cols) > 0:
+        target_col = st.selectbox("Visualize Distribution", ctx.numeric_cols)
         st.bar_chart(df[target_col].value_counts().sort_index())
     else:
         st.info("No numeric columns to visualize.")
\ No newline at end of file
@@ -5,7 +5,7 @@ from src.wrangler import (
     load_schema_config, recommend_mappings, split_column, 
     fill_missing, rename_and_export, anonymize_column
 )
-from src.loaders import load_data
+from src.loaders import load_data, save_data
 from src.profiler import scan_for_pii
 
 # --- CONFIG ---
@@ -42,6 +42,8 @@ st.divider()
 # --- STEP 1: INGESTION (Task Specific) ---
 if 'bridge_df' not in st.session_state:
     st.session_state['bridge_df'] = None
+if 'bridge_cache' not in st.session_state:
+    st.session_state['bridge_cache'] = {} # {(sample path, mtime): DataFrame}
 
 col_upload, col_sample = st.columns([1, 1])
 
@@ -49,11 +51,13 @@ col_upload, col_sample = st.columns([1, 1])
 with col_upload:
     st.markdown("#### Option A: Upload New File")
     uploaded_file = st.file_uploader("Upload CSV or Excel", type=['csv', 'xlsx'], key="bridge_uploader")
-    if uploaded_file:
+    # Ingest each upload once: later reruns keep the wrangled bridge_df, and a
+    # sample loaded afterwards isn't overwritten by the upload still in the widget
+    if uploaded_file and st.session_state.get('bridge_upload_id') != uploaded_file.file_id:
         try:
             df = load_data(uploaded_file, uploaded_file.name)
             st.session_state['bridge_df'] = df
-            st.rerun() # Refresh to show analysis immediately
+            st.session_state['bridge_upload_id'] = uploaded_file.file_id
         except Exception as e:
             st.error(f"Load Error: {e}")
 
@@ -83,9 +87,13 @@ with col_sample:
             if st.button(f"Load {selected_sample}", type="secondary"):
                 try:
                     full_path = os.path.join(target_sample_folder, selected_sample)
-                    df = load_data(full_path, selected_sample)
-                    st.session_state['bridge_df'] = df
-                    st.rerun()
+                    # mtime in the key: an edited sample file is read again
+                    cache_key = (full_path, os.path.getmtime(full_path))
+                    bridge_cache = st.session_state['bridge_cache']
+                    if cache_key not in bridge_cache:
+                        bridge_cache[cache_key] = load_data(full_path, selected_sample)
+                    # Copy: the wrangling tools edit bridge_df in place
+                    st.session_state['bridge_df'] = bridge_cache[cache_key].copy()
                 except Exception as e:
                     st.error(f"Error loading sample: {e}")
     else:
@@ -159,6 +167,9 @@ if st.session_state['bridge_df'] is not None:
         st.caption("Map your columns to the target schema.")
         col_container = st.container()
         
+        # Same choices for every target: build once
+        options = ["-- MISSING --", *df.columns.tolist()]
+
         # Grid Layout for Mapping
         for target_col in schema['columns']:
             t_name = target_col['name']
@@ -170,7 +181,6 @@ if st.session_state['bridge_df'] is not None:
             label = f"**{t_name}**" + (" <span style='color:red'>*</span>" if t_req else "")
             c_lbl.markdown(label, unsafe_allow_html=True)
             
-            options = ["-- MISSING --"] + list(df.columns)
             default_idx = options.index(suggested) if suggested in options else 0
             
             selection = c_inp.selectbox(f"Map {t_name}", options, index=default_idx, key=f"map_{t_name}", label_visibility="collapsed")
@@ -212,9 +222,12 @@ if st.session_state['bridge_df'] is not None:
             val = c_f3.text_input("Value (if Static)")
             
             if st.button("Apply Fill"):
-                df = fill_missing(df, fill_target, method, val)
-                st.session_state['bridge_df'] = df
-                st.rerun()
+                try:
+                    df = fill_missing(df, fill_target, method, val)
+                    st.session_state['bridge_df'] = df
+                    st.rerun()
+                except Exception as e:
+                    st.error(f"Error: {e}")
                 
         # Tool 3: Anonymization
         with st.expander("🛡️ Privacy & Anonymization"):
@@ -246,7 +259,7 @@ if st.session_state['bridge_df'] is not None:
             
             os.makedirs("assets", exist_ok=True)
             save_path = "assets/ready_for_transport.csv"
-            final_df.to_csv(save_path, index=False)
+            save_data(final_df, save_path)
             
             st.success("File Standardized & Saved!")
             
@@ -0,0 +1,59 @@
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+from src.caching import cache_by_frame
+from src.frame_utils import column_quartiles, count_duplicate_rows, numeric_matrix, partition_columns
+from src import fast_stats
+
+
+@dataclass
+class AuditContext:
+    """
+    Per-frame panels shared by the audit functions, built once per load so
+    each analyzer doesn't repeat select_dtypes / isnull / duplicated passes.
+    """
+    numeric_cols: list       # Same columns as select_dtypes(include=np.number)
+    text_cols: list          # Same columns as select_dtypes(include=['object', 'string'])
+    values: np.ndarray       # rows x numeric_cols, NaN for missing; float32 when lossless
+    q25: np.ndarray          # Per-column quartiles (NaNs skipped)
+    q75: np.ndarray
+    null_counts: pd.Series   # Missing values per column (all columns)
+    nunique: pd.Series       # Distinct non-null values per column
+    dup_count: int           # Same as df.duplicated().sum()
+
+
+def _downcast(values: np.ndarray) -> np.ndarray:
+    """
+    float32 halves the bytes every later pass reads, but only if no value
+    changes on the way down (small ints, already-float32 data).
+    """
+    with np.errstate(over='ignore'):
+        values32 = values.astype(np.float32)
+    if np.array_equal(values32, values, equal_nan=True):
+        return values32
+    return values
+
+
+@cache_by_frame
+def build_audit_context(df: pd.DataFrame, use_polars: bool = False) -> AuditContext:
+    """
+    Computes the shared panels for df. Cached, so every page gets the same
+    instance until the frame's content changes.
+    """
+    parts = partition_columns(df)
+    numeric_cols = parts["numeric"]
+    values = _downcast(numeric_matrix(df[numeric_cols]))
+    q25, q75 = column_quartiles(values)
+    stats = fast_stats.column_stats(df, use_polars) # Nulls and distinct counts in one pass
+
+    return AuditContext(
+        numeric_cols=numeric_cols,
+        text_cols=parts["text"],
+        values=values,
+        q25=q25,
+        q75=q75,
+        null_counts=stats.null_counts,
+        nunique=stats.nunique,
+        dup_count=count_duplicate_rows(df),
+    )
@@ -0,0 +1,76 @@
+import functools
+import pandas as pd
+import streamlit as st
+from src.frame_utils import row_hashes
+
+# Rows hashed by sample_fingerprint()
+SAMPLE_ROWS = 1000
+
+# Bounds for every cache in the app: results expire after an hour, and each
+# cached function keeps at most this many (frame, arguments) entries
+CACHE_TTL = 60 * 60
+CACHE_MAX_ENTRIES = 32
+
+def frame_fingerprint(df: pd.DataFrame) -> tuple:
+    """
+    Cheap cache key for a DataFrame: shape, schema and a scalar content digest.
+    Content is part of the key because the Data Bridge tools edit frames in place.
+    """
+    return (
+        df.shape,
+        tuple(df.columns),
+        tuple(df.dtypes.astype(str)),
+        int(row_hashes(df).sum()),
+    )
+
+
+def sample_fingerprint(df: pd.DataFrame) -> tuple:
+    """
+    Like frame_fingerprint, but only hashes the first SAMPLE_ROWS rows. Enough
+    for analyzers that only read column names or a head sample themselves.
+    """
+    return (
+        df.shape,
+        tuple(df.columns),
+        tuple(df.dtypes.astype(str)),
+        int(row_hashes(df.head(SAMPLE_ROWS)).sum()),
+    )
+
+
+# An AuditContext is derived from the DataFrame passed alongside it, so the
+# frame's fingerprint already keys it (named by path to avoid a circular import)
+_CONTEXT_TYPE = 'src.audit_context.AuditContext'
+
+def cache_by_frame(func):
+    """
+    Decorator for pure analyzers taking a DataFrame first: results survive
+    reruns until the frame's content changes. Callers holding the frame's
+    fingerprint (computed once per load) pass it as fingerprint=, so a cache
+    hit doesn't rehash the whole frame; without it the key is computed here.
+    """
+    def cached(_df, fingerprint, *args, **kwargs):
+        return func(_df, *args, **kwargs) # _df: skipped by Streamlit's hasher
+
+    # Streamlit keys each cache on module + qualname (the source is shared)
+    cached.__module__ = func.__module__
+    cached.__qualname__ = f"{func.__qualname__}.cached"
+    cached = st.cache_data(
+        cached, show_spinner=False, max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL,
+        hash_funcs={_CONTEXT_TYPE: lambda ctx: None},
+    )
+
+    @functools.wraps(func)
+    def wrapper(df, *args, fingerprint=None, **kwargs):
+        if fingerprint is None:
+            fingerprint = frame_fingerprint(df)
+        return cached(df, fingerprint, *args, **kwargs)
+
+    wrapper.clear = cached.clear
+    return wrapper
+
+
+# Same, keyed on the head sample only (O(SAMPLE_ROWS) per rerun)
+cache_by_sample = st.cache_data(
+    show_spinner=False, max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL,
+    hash_funcs={pd.DataFrame: sample_fingerprint},
+)
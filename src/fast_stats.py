@@ -0,0 +1,85 @@
+import pandas as pd
+from collections import namedtuple
+from joblib import Parallel, delayed
+
+# Optional: Polars runs these column aggregations multi-threaded
+try:
+    import polars as pl
+    HAS_POLARS = True
+except ImportError:
+    HAS_POLARS = False
+
+# Per-column panels consumed by the audit views
+ColumnStats = namedtuple('ColumnStats', ['null_counts', 'nunique'])
+
+# Below this many cells, thread start-up costs more than it saves
+PARALLEL_MIN_CELLS = 1_000_000
+
+
+def map_columns(func, df: pd.DataFrame) -> list:
+    """
+    [func(series) for each column]. Large frames fan out over a thread pool:
+    the per-column kernels (hash tables, Arrow compute) release the GIL.
+    """
+    columns = [df.iloc[:, i] for i in range(df.shape[1])]
+    if df.size < PARALLEL_MIN_CELLS or len(columns) < 2:
+        return [func(s) for s in columns]
+    return Parallel(n_jobs=-1, prefer='threads')(delayed(func)(s) for s in columns)
+
+
+def _pandas_nunique(df: pd.DataFrame) -> pd.Series:
+    return pd.Series(map_columns(pd.Series.nunique, df), index=df.columns, dtype='int64')
+
+
+def _to_polars(df: pd.DataFrame, use_polars: bool):
+    """
+    Returns a Polars frame, or None when the pandas path should be used.
+    """
+    if not (use_polars and HAS_POLARS):
+        return None
+    try:
+        # Zero-copy for Arrow-backed and numeric columns; NaN becomes null
+        return pl.from_pandas(df)
+    except Exception:
+        # Mixed-type object columns, non-string or duplicate column names
+        return None
+
+
+def null_counts(df: pd.DataFrame, use_polars: bool = True) -> pd.Series:
+    """
+    Missing values per column, same as df.isna().sum().
+    """
+    pl_df = _to_polars(df, use_polars)
+    if pl_df is None:
+        return df.isna().sum()
+    return pl_df.null_count().to_pandas().iloc[0].astype('int64')
+
+
+def nunique(df: pd.DataFrame, use_polars: bool = True) -> pd.Series:
+    """
+    Distinct non-null values per column, same as df.nunique().
+    """
+    pl_df = _to_polars(df, use_polars)
+    if pl_df is None:
+        return _pandas_nunique(df)
+    return pl_df.select(pl.all().drop_nulls().n_unique()).to_pandas().iloc[0].astype('int64')
+
+
+def column_stats(df: pd.DataFrame, use_polars: bool = True) -> ColumnStats:
+    """
+    Null and distinct counts per column. On Polars both aggregations go into
+    one lazy plan, so the frame is converted and scanned once.
+    """
+    pl_df = _to_polars(df, use_polars)
+    if pl_df is None:
+        return ColumnStats(df.isna().sum(), _pandas_nunique(df))
+
+    row = pl_df.lazy().select(
+        pl.all().null_count().name.suffix('__nulls'),
+        pl.all().drop_nulls().n_unique().name.suffix('__unique'),
+    ).collect().row(0)
+    n = df.shape[1]
+    return ColumnStats(
+        null_counts=pd.Series(row[:n], index=df.columns, dtype='int64'),
+        nunique=pd.Series(row[n:], index=df.columns, dtype='int64'),
+    )
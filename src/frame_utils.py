@@ -0,0 +1,204 @@
+import importlib.util
+import warnings
+from typing import TYPE_CHECKING
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+# Pure DataFrame helpers shared by src/ and utils/. Nothing here imports
+# Streamlit or scikit-learn, so utils/ stays usable outside the app.
+
+if TYPE_CHECKING:
+    from src.audit_context import AuditContext
+
+# Arrow-backed columns: validity bitmaps instead of boolean null masks,
+# native strings instead of Python objects
+DTYPE_BACKEND = 'pyarrow'
+
+# Optional: python-calamine enables pandas' engine='calamine' for .xlsx
+HAS_CALAMINE = importlib.util.find_spec('python_calamine') is not None
+
+# Optional: numba fuses both IQR comparisons and the column sums into one
+# pass. Imported on first use only (the import alone takes over a second).
+HAS_NUMBA = importlib.util.find_spec('numba') is not None
+
+# dtype.kind codes matched by select_dtypes(include='number')
+NUMERIC_KINDS = "iufcm"
+
+# Text that pd.to_numeric would parse as a number
+NUMERIC_TEXT = r'^\s*[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?\s*$'
+
+
+def has_undecoded_bytes(df: pd.DataFrame) -> bool:
+    """
+    The pyarrow engine does not raise on invalid UTF-8; it returns the whole
+    column as binary instead. Treat that as a decode failure.
+    """
+    return any(
+        isinstance(dtype, pd.ArrowDtype)
+        and (pa.types.is_binary(dtype.pyarrow_dtype) or pa.types.is_large_binary(dtype.pyarrow_dtype))
+        for dtype in df.dtypes
+    )
+
+
+def row_hashes(df: pd.DataFrame) -> pd.Series:
+    """
+    Vectorized 64-bit hash per row (index excluded).
+    """
+    try:
+        return pd.util.hash_pandas_object(df, index=False)
+    except TypeError:
+        # Unhashable cells (lists, dicts): hash their string form instead
+        return pd.util.hash_pandas_object(df.astype(str), index=False)
+
+
+def count_duplicate_rows(df: pd.DataFrame) -> int:
+    """
+    Same count as df.duplicated().sum(), from one vectorized row-hash pass
+    (barring a 64-bit hash collision). Object columns hash 1 and '1', or None
+    and NaN, alike where duplicated() doesn't, so those frames use duplicated().
+    """
+    if any(dtype == object for dtype in df.dtypes):
+        return int(df.duplicated().sum())
+    signed_zero = [
+        j for j, dtype in enumerate(df.dtypes)
+        if dtype.kind == 'f' and not isinstance(dtype, pd.ArrowDtype)
+    ]
+    if signed_zero:
+        # NumPy floats hash -0.0 and 0.0 apart; adding 0.0 maps -0.0 to 0.0
+        df = df.copy(deep=False)
+        for j in signed_zero:
+            df.isetitem(j, df.iloc[:, j] + 0.0)
+    return len(df) - int(row_hashes(df).nunique())
+
+
+def partition_columns(df: pd.DataFrame) -> dict:
+    """
+    Column names grouped as select_dtypes() groups them, from one pass over
+    df.dtypes instead of a select_dtypes() call (and DataFrame view) per group:
+    'numeric' (include='number'), 'text' (include=['object', 'string']),
+    'category' and 'datetime'.
+    """
+    parts = {"numeric": [], "text": [], "category": [], "datetime": []}
+    for col, dtype in df.dtypes.items():
+        if dtype.kind in NUMERIC_KINDS:
+            parts["numeric"].append(col)
+        elif dtype.kind == 'M':
+            parts["datetime"].append(col)
+        elif isinstance(dtype, pd.CategoricalDtype):
+            parts["category"].append(col)
+        elif dtype == object or isinstance(dtype, pd.StringDtype) or (
+            isinstance(dtype, pd.ArrowDtype) and dtype.kind in 'OU'
+        ):
+            parts["text"].append(col) # Includes Arrow binary/decimal/nested, like select_dtypes
+    return parts
+
+
+def numeric_text_ratio(series: pd.Series) -> float:
+    """
+    Share of rows (nulls included) holding number-like text. One vectorized
+    regex match; Arrow-backed strings run it in Arrow's native kernel.
+    """
+    if len(series) == 0:
+        return 0.0
+    values = series.dropna()
+    if values.dtype == object:
+        values = values.astype(str)
+    return float(values.str.match(NUMERIC_TEXT).sum()) / len(series)
+
+
+def numeric_matrix(numeric_df: pd.DataFrame) -> np.ndarray:
+    """
+    float64 matrix of numeric columns, NaN for missing. Timedeltas (kind 'm')
+    don't cast to float, so they go in as nanoseconds with NaT -> NaN.
+    """
+    if not any(dtype.kind == 'm' for dtype in numeric_df.dtypes):
+        return numeric_df.to_numpy(dtype=np.float64, na_value=np.nan)
+    values = np.empty(numeric_df.shape, dtype=np.float64, order='F')
+    for j in range(numeric_df.shape[1]):
+        series = numeric_df.iloc[:, j]
+        if series.dtype.kind == 'm':
+            td = series.to_numpy(dtype='timedelta64[ns]', na_value=np.timedelta64('NaT'))
+            values[:, j] = td.view('i8')
+            values[np.isnat(td), j] = np.nan
+        else:
+            values[:, j] = series.to_numpy(dtype=np.float64, na_value=np.nan)
+    return values
+
+
+def column_quartiles(values: np.ndarray) -> tuple:
+    """
+    Q1 and Q3 per column, matching Series.quantile (linear, NaNs skipped).
+    """
+    if values.shape[0] == 0:
+        empty = np.full(values.shape[1], np.nan)
+        return empty, empty
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning) # All-NaN columns -> NaN
+        q25, q75 = np.nanquantile(values, [0.25, 0.75], axis=0)
+    return q25.astype(np.float64), q75.astype(np.float64)
+
+
+_count_outside = None # Compiled kernel, see _outside_kernel()
+
+
+def _outside_kernel():
+    """
+    Compiles the numba IQR kernel on first call (cached on disk afterwards).
+    """
+    global _count_outside
+    if _count_outside is None:
+        from numba import njit
+
+        # No fastmath: it assumes no NaNs, and NaN must compare False here.
+        # Serial on purpose: Streamlit calls this from a script thread, and
+        # numba's parallel backends can hang interpreter exit when launched
+        # off the main thread.
+        @njit(cache=True)
+        def count_outside(values, lower, upper):
+            n, m = values.shape
+            out = np.zeros(m, np.int64)
+            for j in range(m):
+                c = 0
+                for i in range(n):
+                    v = values[i, j]
+                    if v < lower[j] or v > upper[j]:
+                        c += 1
+                out[j] = c
+            return out
+
+        _count_outside = count_outside
+    return _count_outside
+
+
+def iqr_counts(values: np.ndarray, q1: np.ndarray, q3: np.ndarray) -> np.ndarray:
+    """
+    Values outside [Q1 - 1.5*IQR, Q3 + 1.5*IQR] per column of a 2-D array.
+    One fused pass with numba; else one matrix-wide comparison.
+    """
+    iqr = q3 - q1
+    lower, upper = q1 - 1.5 * iqr, q3 + 1.5 * iqr
+    # The kernel walks columns, so it only pays off on column-major arrays
+    # (what DataFrame.to_numpy returns for numeric frames)
+    if HAS_NUMBA and values.size and values.flags.f_contiguous:
+        return _outside_kernel()(values, lower, upper)
+    mask = (values < lower) | (values > upper)
+    return mask.sum(axis=0)
+
+
+def iqr_outlier_counts(numeric_df: pd.DataFrame) -> pd.Series:
+    """
+    iqr_counts() for a numeric DataFrame: one quantile call instead of a loop
+    over columns.
+    """
+    values = numeric_matrix(numeric_df)
+    q1, q3 = column_quartiles(values)
+    return pd.Series(iqr_counts(values, q1, q3), index=numeric_df.columns)
+
+
+def context_outlier_counts(ctx: "AuditContext") -> pd.Series:
+    """
+    iqr_outlier_counts() over the shared numeric matrix of an AuditContext.
+    """
+    return pd.Series(iqr_counts(ctx.values, ctx.q25, ctx.q75), index=ctx.numeric_cols)
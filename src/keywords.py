@@ -0,0 +1,35 @@
+import re
+
+# Optional: pyahocorasick checks every keyword in one pass over the text
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+
+class KeywordMatcher:
+    """
+    Substring test against a fixed keyword list, compiled once: an
+    Aho-Corasick automaton with pyahocorasick, else one alternation regex.
+    Either way the cost per call grows with the text, not the keyword count.
+    """
+
+    def __init__(self, keywords):
+        self.keywords = tuple(keywords)
+        self._automaton = None
+        self._regex = None
+        if not self.keywords:
+            return
+        if ahocorasick is not None:
+            self._automaton = ahocorasick.Automaton()
+            for k in self.keywords:
+                self._automaton.add_word(k, k)
+            self._automaton.make_automaton()
+        else:
+            self._regex = re.compile("|".join(map(re.escape, self.keywords)))
+
+    def matches(self, text: str) -> bool:
+        """True if any keyword occurs in text (stops at the first hit)."""
+        if self._automaton is not None:
+            return next(self._automaton.iter(text), None) is not None
+        return self._regex is not None and self._regex.search(text) is not None
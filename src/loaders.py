@@ -1,7 +1,16 @@
+import hashlib
+import os
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import streamlit as st
 from io import BytesIO
+from streamlit.runtime.uploaded_file_manager import UploadedFile
+from src.caching import CACHE_TTL
+from src.frame_utils import DTYPE_BACKEND, HAS_CALAMINE, has_undecoded_bytes
 
-def load_data(source, filename: str) -> pd.DataFrame:
+
+def read_data(source, filename: str) -> pd.DataFrame:
     """
     Pure Python: Loads data from a buffer (Upload) or a path (Sample).
     """
@@ -10,19 +19,81 @@ def load_data(source, filename: str) -> pd.DataFrame:
         is_path = isinstance(source, str)
 
         if filename.endswith('.csv'):
+            try:
+                # Fast path: Arrow's multithreaded parser
+                df = pd.read_csv(source, engine='pyarrow', encoding='utf-8', dtype_backend=DTYPE_BACKEND)
+                if not has_undecoded_bytes(df):
+                    return df
+            except Exception:
+                pass # pyarrow missing or parser failure -> C engine
+
+            if not is_path and hasattr(source, 'seek'):
+                source.seek(0) # Reset buffer pointer
             try:
                 # Try UTF-8 first
-                return pd.read_csv(source, encoding='utf-8')
+                return pd.read_csv(
+                    source, engine='c', encoding='utf-8', low_memory=False, dtype_backend=DTYPE_BACKEND
+                )
             except UnicodeDecodeError:
                 # Fallback to Latin-1
-                if not is_path and hasattr(source, 'seek'): 
+                if not is_path and hasattr(source, 'seek'):
                     source.seek(0) # Reset buffer pointer
-                return pd.read_csv(source, encoding='latin-1')
-                
-        elif filename.endswith(('.xls', '.xlsx')):
-            return pd.read_excel(source)
+                return pd.read_csv(
+                    source, engine='c', encoding='latin-1', low_memory=False, dtype_backend=DTYPE_BACKEND
+                )
+
+        elif filename.endswith('.xlsx'):
+            if HAS_CALAMINE:
+                # Rust reader, faster than openpyxl's XML parsing
+                return pd.read_excel(source, engine='calamine', dtype_backend=DTYPE_BACKEND)
+            return pd.read_excel(source, engine='openpyxl', dtype_backend=DTYPE_BACKEND)
+
+        elif filename.endswith('.xls'):
+            return pd.read_excel(source, dtype_backend=DTYPE_BACKEND)
         else:
             raise ValueError(f"Unsupported file format: {filename}")
-            
+
     except Exception as e:
-        raise RuntimeError(f"Data Load Error: {e}")
\ No newline at end of file
+        raise RuntimeError(f"Data Load Error: {e}")
+
+
+def _hash_upload(uploaded_file: UploadedFile) -> str:
+    # Key uploads on their content, not on the widget object
+    return hashlib.md5(uploaded_file.getvalue()).hexdigest()
+
+
+# Parsed frames are the largest cache entries, so keep only a few
+MAX_CACHED_LOADS = 4
+
+@st.cache_data(
+    show_spinner=False, max_entries=MAX_CACHED_LOADS, ttl=CACHE_TTL,
+    hash_funcs={UploadedFile: _hash_upload},
+)
+def _load_cached(source, filename: str, mtime) -> pd.DataFrame:
+    if not isinstance(source, str):
+        source.seek(0)
+    return read_data(source, filename)
+
+
+def load_data(source, filename: str) -> pd.DataFrame:
+    """
+    Cached entry point used by the pages. Streamlit reruns the whole script on
+    every widget interaction, so parsing is only repeated when the upload bytes
+    or the sample file's mtime change.
+    """
+    is_path = isinstance(source, str)
+    mtime = os.path.getmtime(source) if is_path and os.path.exists(source) else None
+    return _load_cached(source, filename, mtime)
+
+
+def save_data(df: pd.DataFrame, path: str) -> None:
+    """
+    Writes df to CSV with Arrow's multithreaded writer. Frames Arrow can't
+    convert (mixed-type object columns) go through pandas instead.
+    """
+    try:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+    except (pa.ArrowInvalid, pa.ArrowTypeError, ValueError):
+        df.to_csv(path, index=False)
+        return
+    pacsv.write_csv(table, path)
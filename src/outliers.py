@@ -1,8 +1,13 @@
 import pandas as pd
 import numpy as np
 from sklearn.ensemble import IsolationForest
+from src.caching import cache_by_frame
+from src.audit_context import AuditContext
+from src.frame_utils import context_outlier_counts, iqr_outlier_counts, numeric_matrix, partition_columns
 
-def detect_anomalies(df: pd.DataFrame) -> dict:
+
+@cache_by_frame
+def detect_anomalies(df: pd.DataFrame, ctx: AuditContext = None) -> dict:
     """
     Runs Dual-Method Outlier Detection:
     1. IQR (Univariate): Good for simple range checks.
@@ -10,19 +15,29 @@ def detect_anomalies(df: pd.DataFrame) -> dict:
     """
     report = {"summary": {}, "rows": []}
     
-    # Select only numeric columns
-    numeric_df = df.select_dtypes(include=[np.number]).dropna()
+    # Select only numeric columns, complete rows only
+    if ctx is not None:
+        values, numeric_cols = ctx.values, ctx.numeric_cols
+    else:
+        numeric_cols = partition_columns(df)["numeric"]
+        values = numeric_matrix(df[numeric_cols]) # Timedeltas as ns, NaT -> NaN
+    complete = ~np.isnan(values).any(axis=1)
+    numeric_df = pd.DataFrame(values[complete], index=df.index[complete], columns=numeric_cols)
     
     if numeric_df.empty:
         return report
 
     # --- Method 1: Isolation Forest (ML) ---
     # Contamination=0.05 means we guess ~5% of data might be anomalous
-    iso = IsolationForest(contamination=0.05, random_state=42)
+    # max_samples=256 caps the rows each tree sees; trees are built in parallel
+    iso = IsolationForest(
+        contamination=0.05, random_state=42, max_samples=min(256, len(numeric_df)), n_jobs=-1
+    )
     try:
-        preds = iso.fit_predict(numeric_df)
+        # The trees compare float32 anyway; converting here skips sklearn's copy
+        preds = iso.fit_predict(numeric_df.to_numpy(dtype=np.float32))
         # -1 indicates anomaly, 1 indicates normal
-        anomaly_indices = numeric_df.index[preds == -1].tolist()
+        anomaly_indices = numeric_df.index[np.flatnonzero(preds == -1)].tolist()
         report["ml_anomalies"] = len(anomaly_indices)
         report["ml_indices"] = anomaly_indices
     except Exception as e:
@@ -30,18 +45,10 @@ def detect_anomalies(df: pd.DataFrame) -> dict:
         report["ml_anomalies"] = 0
 
     # --- Method 2: IQR (Statistical) ---
-    iqr_counts = {}
-    for col in numeric_df.columns:
-        q1 = numeric_df[col].quantile(0.25)
-        q3 = numeric_df[col].quantile(0.75)
-        iqr = q3 - q1
-        lower_bound = q1 - 1.5 * iqr
-        upper_bound = q3 + 1.5 * iqr
-        
-        count = ((numeric_df[col] < lower_bound) | (numeric_df[col] > upper_bound)).sum()
-        if count > 0:
-            iqr_counts[col] = int(count)
-            
-    report["iqr_outliers"] = iqr_counts
+    if ctx is not None and complete.all():
+        counts = context_outlier_counts(ctx) # No rows dropped: shared quartiles apply
+    else:
+        counts = iqr_outlier_counts(numeric_df)
+    report["iqr_outliers"] = {col: int(count) for col, count in counts.items() if count > 0}
     
     return report
\ No newline at end of file
@@ -1,27 +1,35 @@
 import pandas as pd
-import numpy as np
+from src.caching import cache_by_frame
+from src import fast_stats
+from src.frame_utils import NUMERIC_KINDS
 
-def generate_profile(df: pd.DataFrame) -> dict:
+
+@cache_by_frame
+def generate_profile(df: pd.DataFrame, use_polars: bool = False) -> dict:
     """
     Generates the 'Schema' view of the dataset.
     """
     profile = {}
+
+    # Column-wise aggregations in one batch (one fused plan on Polars)
+    stats = fast_stats.column_stats(df, use_polars)
+    uniques, missing = stats.nunique, stats.null_counts
     
     for col in df.columns:
         col_data = df[col]
         
-        # Detect Type
+        # Detect Type (dtype.kind also works for Arrow-backed columns)
         dtype = str(col_data.dtype)
-        if np.issubdtype(col_data.dtype, np.number):
+        if col_data.dtype.kind in NUMERIC_KINDS:
             kind = "Numeric"
-        elif np.issubdtype(col_data.dtype, np.datetime64):
+        elif col_data.dtype.kind == 'M':
             kind = "DateTime"
         else:
             kind = "Categorical"
             
         # Stats
-        unique_count = col_data.nunique()
-        missing_count = int(col_data.isnull().sum())
+        unique_count = int(uniques[col])
+        missing_count = int(missing[col])
         
         profile[col] = {
             "type": dtype,
@@ -34,41 +42,99 @@ def generate_profile(df: pd.DataFrame) -> dict:
     return profile
 
 
+def dtype_kinds(df: pd.DataFrame) -> dict:
+    """
+    Maps each column to its dtype.kind code, so callers can filter columns
+    without repeating select_dtypes() on every rerun.
+    """
+    return {col: dtype.kind for col, dtype in df.dtypes.items()}
+
+
 import pandas as pd
 import re
+from src.caching import cache_by_sample
+from src.keywords import KeywordMatcher
 
+# Optional: google-re2 matches all PII patterns in one linear-time pass
+try:
+    import re2
+except ImportError:
+    re2 = None
+
+# Regex Patterns for common PII (dict order = reporting priority)
+PII_PATTERNS = {
+    "Email": r"(?i)[^@]+@[^@]+\.[^@]+",
+    "Phone": r"(?i)(\+\d{1,2}\s)?\(?\d{3}\)?[\s.-]\d{3}[\s.-]\d{4}",
+    "SSN/ID": r"(?i)\b\d{3}-\d{2}-\d{4}\b",  # Simple US SSN
+    "Credit Card": r"(?i)\b(?:\d[ -]*?){13,16}\b",
+    "IPv4": r"(?i)\b\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}\b"
+}
+PII_NAMES = list(PII_PATTERNS)
+
+# Keyword fallback (if regex is too slow for big data, check names)
+KEYWORD_TRIGGERS = ["password", "secret", "dob", "birth", "social", "tax", "credit"]
+_KEYWORD_MATCHER = KeywordMatcher(KEYWORD_TRIGGERS)
+
+
+def _compile_pii_set():
+    """
+    Compiles every pattern into a single RE2 set (one DFA). None without re2.
+    """
+    if re2 is None:
+        return None
+    pii_set = re2.Set.SearchSet()
+    for p_regex in PII_PATTERNS.values():
+        pii_set.Add(p_regex)
+    pii_set.Compile()
+    return pii_set
+
+
+# Compiled once at import, not per call
+_PII_SET = _compile_pii_set()
+# ASCII mode: RE2's \d and \b only know ASCII, and both paths must flag the same values
+_PII_REGEX = {p_name: re.compile(p_regex, re.ASCII) for p_name, p_regex in PII_PATTERNS.items()}
+
+
+def _match_pii(sample: pd.Series):
+    """
+    Returns the highest-priority PII type matched by any sample value, or None.
+    """
+    if _PII_SET is not None:
+        matched = set()
+        for value in sample:
+            matched.update(_PII_SET.Match(value) or ())
+            if 0 in matched:
+                break # Top priority already found
+        return PII_NAMES[min(matched)] if matched else None
+
+    values = sample.tolist() # Plain strings once, not per pattern
+    for p_name, p_regex in _PII_REGEX.items():
+        # If any value in sample matches (stops at the first hit)
+        if any(p_regex.search(v) for v in values):
+            return p_name
+    return None
+
+
+@cache_by_sample
 def scan_for_pii(df: pd.DataFrame) -> dict:
     """
     Scans columns for potential PII (Personally Identifiable Information).
     Returns a dict of {column_name: pii_type}.
     """
     pii_report = {}
-    
-    # Regex Patterns for common PII
-    patterns = {
-        "Email": r"(?i)[^@]+@[^@]+\.[^@]+",
-        "Phone": r"(?i)(\+\d{1,2}\s)?\(?\d{3}\)?[\s.-]\d{3}[\s.-]\d{4}",
-        "SSN/ID": r"(?i)\b\d{3}-\d{2}-\d{4}\b",  # Simple US SSN
-        "Credit Card": r"(?i)\b(?:\d[ -]*?){13,16}\b",
-        "IPv4": r"(?i)\b\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}\b"
-    }
-    
-    # Keyword fallback (if regex is too slow for big data, check names)
-    keyword_triggers = ["password", "secret", "dob", "birth", "social", "tax", "credit"]
 
     for col in df.columns:
         # 1. Check Column Name Context
-        if any(k in col.lower() for k in keyword_triggers):
+        col_lower = col.lower()
+        if _KEYWORD_MATCHER.matches(col_lower):
             pii_report[col] = "Potential Sensitive Keyword"
             continue
             
         # 2. Check Content (Sample first 20 non-null rows)
-        if df[col].dtype == object:
+        if pd.api.types.is_string_dtype(df[col].dtype):
             sample = df[col].dropna().head(20).astype(str)
-            for p_name, p_regex in patterns.items():
-                # If any value in sample matches
-                if sample.str.contains(p_regex, regex=True).any():
-                    pii_report[col] = p_name
-                    break
+            p_name = _match_pii(sample)
+            if p_name:
+                pii_report[col] = p_name
                     
-    return pii_report
\ No newline at end of file
+    return pii_report
@@ -1,7 +1,29 @@
 import pandas as pd
 import numpy as np
+from src.caching import cache_by_frame
+from src.audit_context import AuditContext
+from src import fast_stats
+from src.frame_utils import numeric_text_ratio, partition_columns
 
-def calculate_readiness_score(df: pd.DataFrame) -> dict:
+
+def _has_inf(df: pd.DataFrame, cols) -> bool:
+    """
+    True if any of cols holds +/-inf. Only float/complex columns are scanned
+    (integers can't be infinite), one at a time, stopping at the first hit.
+    """
+    for col in cols:
+        series = df[col]
+        if series.dtype.kind not in "fc":
+            continue
+        # NumPy columns are viewed without a copy; Arrow/masked ones need NaN for nulls
+        values = series.to_numpy() if isinstance(series.dtype, np.dtype) else series.to_numpy(na_value=np.nan)
+        if np.isinf(values).any():
+            return True
+    return False
+
+
+@cache_by_frame
+def calculate_readiness_score(df: pd.DataFrame, ctx: AuditContext = None) -> dict:
     """
     Computes a 0-100 score based on 3 pillars:
     1. Completeness (Are values missing?)
@@ -16,7 +38,10 @@ def calculate_readiness_score(df: pd.DataFrame) -> dict:
         return {"score": 0, "grade": "F", "breakdown": ["Empty Dataset"]}
 
     # --- Pillar 1: Completeness (Max Penalty: 40) ---
-    missing_total = df.isnull().sum().sum()
+    if ctx is not None:
+        missing_total = int(ctx.null_counts.sum())
+    else:
+        missing_total = int(total_cells - df.count().sum())
     missing_ratio = missing_total / total_cells
     
     p_completeness = min(40, missing_ratio * 100 * 1.5) # Penalty multiplier
@@ -26,7 +51,8 @@ def calculate_readiness_score(df: pd.DataFrame) -> dict:
 
     # --- Pillar 2: Cardinality / Constant Columns (Max Penalty: 20) ---
     # Check for columns with only 1 unique value (useless for ML)
-    constant_cols = [c for c in df.columns if df[c].nunique() <= 1]
+    uniques = ctx.nunique if ctx is not None else fast_stats.nunique(df, use_polars=False)
+    constant_cols = [c for c in df.columns if uniques[c] <= 1]
     if constant_cols:
         p_const = 5 * len(constant_cols)
         score -= p_const
@@ -35,12 +61,12 @@ def calculate_readiness_score(df: pd.DataFrame) -> dict:
     # --- Pillar 3: Type Interpretation (Max Penalty: 20) ---
     # Penalize Object columns that look like numbers
     # (Simple heuristic implementation)
-    obj_cols = df.select_dtypes(include=['object']).columns
+    obj_cols = ctx.text_cols if ctx is not None else partition_columns(df)["text"]
     bad_types = 0
     for col in obj_cols:
         # If >80% are numbers but it's an object, it's a dirty column
         try:
-            numeric_rate = pd.to_numeric(df[col], errors='coerce').notnull().mean()
+            numeric_rate = numeric_text_ratio(df[col])
             if numeric_rate > 0.8:
                 bad_types += 1
         except:
@@ -67,15 +93,20 @@ def calculate_readiness_score(df: pd.DataFrame) -> dict:
     }
 
 
-def assess_model_suitability(df: pd.DataFrame) -> dict:
+@cache_by_frame
+def assess_model_suitability(df: pd.DataFrame, ctx: AuditContext = None) -> dict:
     """
     Evaluates dataset against specific ML Model requirements.
     """
     report = {}
     
-    num_cols = df.select_dtypes(include='number').columns
-    cat_cols = df.select_dtypes(include='object').columns
-    missing_ratio = df.isnull().mean().mean()
+    if ctx is not None:
+        num_cols, cat_cols = ctx.numeric_cols, ctx.text_cols
+        missing_ratio = (ctx.null_counts / len(df)).mean()
+    else:
+        parts = partition_columns(df)
+        num_cols, cat_cols = parts["numeric"], parts["text"]
+        missing_ratio = df.isnull().mean().mean()
     rows = df.shape[0]
 
     # 1. REGRESSION (Needs numeric data, high correlation potential)
@@ -105,7 +136,8 @@ def assess_model_suitability(df: pd.DataFrame) -> dict:
         ga_score = 0
     else:
         # Check for infinite values
-        if np.isinf(df[num_cols]).values.any(): ga_score -= 50
+        has_inf = np.isinf(ctx.values).any() if ctx is not None else _has_inf(df, num_cols)
+        if has_inf: ga_score -= 50
         # High dimensionality hurts GA convergence
         if len(num_cols) > 100: ga_score -= 20 
     
@@ -1,30 +1,34 @@
 import pandas as pd
-import numpy as np
+from src.audit_context import AuditContext
+from src.frame_utils import count_duplicate_rows, context_outlier_counts, iqr_outlier_counts, partition_columns
 
-def run_global_audit(df: pd.DataFrame) -> dict:
+def run_global_audit(df: pd.DataFrame, ctx: AuditContext = None) -> dict:
     """
     General health check: Types, Nulls, Duplicates, Outliers.
+    Pass ctx (see build_audit_context) to reuse the shared per-frame panels.
     """
+    if ctx is not None:
+        duplicates, null_counts = ctx.dup_count, ctx.null_counts
+        numeric_cols = ctx.numeric_cols
+        outlier_counts = context_outlier_counts(ctx)
+    else:
+        duplicates, null_counts = count_duplicate_rows(df), df.isnull().sum()
+        numeric_cols = partition_columns(df)["numeric"]
+        outlier_counts = iqr_outlier_counts(df[numeric_cols])
+
     report = {
         "shape": df.shape,
-        "duplicates": int(df.duplicated().sum()),
+        "duplicates": int(duplicates),
         "columns": {}
     }
     
-    numeric_cols = df.select_dtypes(include=np.number).columns
-    
     for col in df.columns:
         # 1. Basic Stats
-        null_count = int(df[col].isnull().sum())
+        null_count = int(null_counts[col])
         dtype = str(df[col].dtype)
         
         # 2. Outlier Detection (IQR)
-        outliers = 0
-        if col in numeric_cols:
-            q1 = df[col].quantile(0.25)
-            q3 = df[col].quantile(0.75)
-            iqr = q3 - q1
-            outliers = int(((df[col] < (q1 - 1.5 * iqr)) | (df[col] > (q3 + 1.5 * iqr))).sum())
+        outliers = int(outlier_counts[col]) if col in outlier_counts.index else 0
 
         report["columns"][col] = {
             "type": dtype,
@@ -1,12 +1,27 @@
 import pandas as pd
+import numpy as np
 import re
 import yaml
 import hashlib
+from functools import lru_cache
+from src.caching import cache_by_sample
 
 def load_schema_config(filepath: str) -> dict:
     with open(filepath, 'r') as f:
         return yaml.safe_load(f)
 
+@lru_cache(maxsize=256)
+def _compile(raw_regex: str):
+    """
+    Compiled, case-insensitive pattern for a schema regex (None if empty).
+    Python re doesn't like inline (?i) in compile, so it is stripped for the flag.
+    """
+    clean_regex = raw_regex.replace('(?i)', '') if raw_regex else None
+    if not clean_regex:
+        return None
+    return re.compile(clean_regex, re.IGNORECASE)
+
+@cache_by_sample
 def recommend_mappings(df: pd.DataFrame, schema: dict) -> dict:
     """
     Matches DF columns to Schema columns using Exact Name & Regex.
@@ -19,13 +34,7 @@ def recommend_mappings(df: pd.DataFrame, schema: dict) -> dict:
     for target in schema['columns']:
         t_name = target['name']
         
-        # FIX: Clean the regex string (Python re doesn't like inline (?i) in compile)
         raw_regex = target.get('regex', '')
-        if raw_regex:
-            clean_regex = raw_regex.replace('(?i)', '')
-        else:
-            clean_regex = None
-            
         match = None
 
         # Strategy 1: Exact Name Match
@@ -33,13 +42,13 @@ def recommend_mappings(df: pd.DataFrame, schema: dict) -> dict:
             match = t_name
         
         # Strategy 2: Regex Pattern Match
-        elif clean_regex:
+        elif raw_regex:
             try:
-                # Compile with IGNORECASE flag
-                pattern = re.compile(clean_regex, re.IGNORECASE)
+                # Compiled once per pattern string, then reused across reruns
+                pattern = _compile(raw_regex)
                 for col in df_cols:
                     if col not in used_cols:
-                        if pattern.search(col):
+                        if pattern and pattern.search(col):
                             match = col
                             break
             except re.error:
@@ -58,23 +67,47 @@ def recommend_mappings(df: pd.DataFrame, schema: dict) -> dict:
 def split_column(df: pd.DataFrame, col: str, delimiter: str, new_names: list) -> pd.DataFrame:
     try:
         split_data = df[col].astype(str).str.split(delimiter, expand=True)
+        missing = pd.Series([None] * len(df), index=df.index, dtype=object)
+        parts = {}
         for i, name in enumerate(new_names):
-            if i < split_data.shape[1]:
-                df[name] = split_data[i]
-            else:
-                df[name] = None
-        return df
+            parts[name] = split_data[i] if i < split_data.shape[1] else missing
+        # Existing names are overwritten in place; the new ones are attached in
+        # a single concat instead of one frame insertion per name
+        for name in [n for n in parts if n in df.columns]:
+            df[name] = parts.pop(name)
+        if not parts:
+            return df
+        return pd.concat([df, pd.DataFrame(parts, index=df.index)], axis=1)
     except Exception as e:
         raise ValueError(f"Split failed: {e}")
 
+def _widen_for_fill(series: pd.Series, value) -> pd.Series:
+    """
+    Integer columns with gaps can't hold a fractional or oversized fill: Arrow
+    ints truncate 17.5 to 17 and raise on 1e30. Move those to float first.
+    """
+    if series.dtype.kind not in "iu" or not series.hasnans or pd.isna(value):
+        return series
+    if float(value).is_integer() and abs(value) < 2**63:
+        return series
+    return series.astype("float64[pyarrow]" if isinstance(series.dtype, pd.ArrowDtype) else "Float64")
+
 def fill_missing(df: pd.DataFrame, col: str, method: str, value=None) -> pd.DataFrame:
     if method == "Static Value":
+        if pd.api.types.is_numeric_dtype(df[col]) and value is not None:
+            # Arrow-backed numeric columns reject text fills
+            try:
+                value = pd.to_numeric(value)
+            except (ValueError, TypeError):
+                raise ValueError(f"'{value}' is not a valid number for column '{col}'")
+            df[col] = _widen_for_fill(df[col], value)
         df[col] = df[col].fillna(value)
     elif method == "Forward Fill":
         df[col] = df[col].ffill()
     elif method == "Mean":
         if pd.api.types.is_numeric_dtype(df[col]):
-            df[col] = df[col].fillna(df[col].mean())
+            mean = df[col].mean()
+            df[col] = _widen_for_fill(df[col], mean).fillna(mean)
     return df
 
 def anonymize_column(df: pd.DataFrame, col: str, method: str) -> pd.DataFrame:
@@ -89,10 +122,13 @@ def anonymize_column(df: pd.DataFrame, col: str, method: str) -> pd.DataFrame:
         df[col] = "*****"
     
     elif method == "Hashing (SHA256)":
-        # One-way hash for IDs
-        df[col] = df[col].astype(str).apply(
-            lambda x: hashlib.sha256(x.encode()).hexdigest() if x and x != 'nan' else x
-        )
+        # One-way hash for IDs (plain loop with a local binding: no per-row
+        # lambda call or Series.apply overhead; missing markers pass through)
+        sha256 = hashlib.sha256
+        df[col] = [
+            sha256(x.encode()).hexdigest() if x and x not in ('nan', '<NA>') else x
+            for x in df[col].astype(str).tolist()
+        ]
         
     elif method == "Generalization (Numeric Bins)":
         # Convert exact age (24) to range (20-30)
@@ -100,9 +136,14 @@ def anonymize_column(df: pd.DataFrame, col: str, method: str) -> pd.DataFrame:
             # Auto-calculate bin size based on range
             min_v, max_v = df[col].min(), df[col].max()
             if pd.notnull(min_v):
-                bins = list(range(int(min_v), int(max_v) + 10, 10))
-                labels = [f"{i}-{i+10}" for i in bins[:-1]]
-                df[col] = pd.cut(df[col], bins=bins, labels=labels).astype(str)
+                edges = np.arange(int(min_v), int(max_v) + 10, 10)
+                # Same (a, b] bins as pd.cut; misses (NaN, values on or below
+                # the first edge) land on the trailing 'nan' label
+                labels = np.array([f"{i}-{i+10}" for i in edges[:-1]] + ["nan"], dtype=object)
+                values = df[col].to_numpy(dtype=float, na_value=np.nan)
+                idx = np.searchsorted(edges, values, side="left") - 1
+                idx[(idx < 0) | (idx >= len(edges) - 1)] = len(labels) - 1
+                df[col] = labels[idx]
                 
     return df
 
@@ -0,0 +1,69 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src import frame_utils
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# Streamlit runs page scripts on a worker thread; the kernel must not leave
+# the interpreter unable to exit afterwards
+KERNEL_IN_THREAD = """
+import threading
+import numpy as np
+from src.frame_utils import iqr_counts
+
+values = np.asfortranarray(np.arange(40.0).reshape(10, 4))
+out = []
+t = threading.Thread(target=lambda: out.append(iqr_counts(values, np.full(4, 10.0), np.full(4, 20.0))))
+t.start()
+t.join()
+print(out[0].tolist())
+"""
+
+
+@pytest.mark.skipif(not frame_utils.HAS_NUMBA, reason="numba not installed")
+def test_iqr_kernel_from_worker_thread_lets_the_process_exit():
+    result = subprocess.run(
+        [sys.executable, "-c", KERNEL_IN_THREAD], cwd=ROOT, capture_output=True, text=True, timeout=120
+    )
+    assert result.returncode == 0, result.stderr
+    # Bounds [-5, 35] for every column: only the last row (36-39) is outside
+    assert result.stdout.strip() == "[1, 1, 1, 1]"
+
+
+@pytest.mark.parametrize("backend", ["numpy_nullable", "pyarrow"])
+def test_iqr_outlier_counts_handles_timedeltas_with_missing_values(backend):
+    durations = pd.to_timedelta(list(range(20)) + [None, 1000], unit="s")
+    df = pd.DataFrame({"d": durations})
+    if backend == "pyarrow":
+        df = df.convert_dtypes(dtype_backend="pyarrow")
+
+    values = frame_utils.numeric_matrix(df)
+
+    assert np.isnan(values[20, 0]) # NaT stays missing instead of -2**63
+    assert frame_utils.iqr_outlier_counts(df).to_dict() == {"d": 1}
+
+
+def test_audit_context_keeps_missing_timedeltas_missing():
+    from src.audit_context import build_audit_context
+
+    df = pd.DataFrame({"d": pd.to_timedelta([1, 2, None, 3], unit="s")})
+    ctx = build_audit_context(df)
+
+    assert np.isnan(ctx.values[2, 0])
+
+
+@pytest.mark.parametrize("df", [
+    pd.DataFrame({"a": [1, "1"]}),
+    pd.DataFrame({"a": [None, np.nan]}, dtype=object),
+    pd.DataFrame({"a": [0.0, -0.0]}),
+    pd.DataFrame({"a": [0.0, -0.0, None, None]}, dtype="Float64"),
+    pd.DataFrame({"a": [1.5, 1.5, 2.0], "b": ["x", "x", "y"]}).convert_dtypes(dtype_backend="pyarrow"),
+])
+def test_count_duplicate_rows_matches_duplicated(df):
+    assert frame_utils.count_duplicate_rows(df) == int(df.duplicated().sum())
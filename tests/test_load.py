@@ -0,0 +1,37 @@
+from utils.load import load_dataset, load_dataset_streaming
+from utils.validate import audit_dataset, audit_streaming
+
+# Column c reads as numbers in the first 3-row chunk and as text in the second
+DRIFT_CSV = "k,c\n" + "1,5\n" * 3 + "2,x\n" + "1,5\n" * 3 + "3,\n" * 3
+
+
+def test_streaming_audit_matches_full_audit_when_chunk_dtypes_drift(tmp_path):
+    path = tmp_path / "drift.csv"
+    path.write_text(DRIFT_CSV)
+
+    full = audit_dataset(load_dataset(str(path)))
+    streamed = audit_streaming(load_dataset_streaming(str(path), chunk_rows=3))
+
+    assert streamed["duplicates"] == full["duplicates"] == 7
+    assert streamed["missing_values"] == full["missing_values"]
+    assert streamed["outliers"] == full["outliers"]
+    assert "c" not in streamed["outliers"]
+
+
+def test_load_dataset_returns_a_frame(tmp_path):
+    path = tmp_path / "drift.csv"
+    path.write_text(DRIFT_CSV)
+
+    assert load_dataset(str(path)).shape == (10, 2)
+
+
+def test_streaming_survives_a_latin1_byte_past_the_sniffed_head(tmp_path):
+    rows = ["id,name"] + [f"{i},name{i}" for i in range(20_000)]
+    rows[-10] = "19990,caf\xe9" # Well past the 64 KB the sniffer reads
+    path = tmp_path / "latin1_tail.csv"
+    path.write_bytes(("\n".join(rows) + "\n").encode("latin-1"))
+
+    report = audit_streaming(load_dataset_streaming(str(path), chunk_rows=5_000))
+
+    assert report["shape"] == (20_000, 2)
+    assert report["duplicates"] == 0
@@ -0,0 +1,36 @@
+import pandas as pd
+import pytest
+
+from src.wrangler import fill_missing
+
+
+def arrow_ints():
+    return pd.DataFrame({"a": pd.array([10, 25, None], dtype="int64[pyarrow]")})
+
+
+def test_mean_fill_keeps_the_fraction_on_arrow_int_columns():
+    out = fill_missing(arrow_ints(), "a", "Mean")
+
+    assert out["a"].tolist() == [10, 25, 17.5]
+    assert out["a"].dtype == "float64[pyarrow]"
+
+
+@pytest.mark.parametrize("value, expected", [("2.5", 2.5), ("1e30", 1e30)])
+def test_static_fill_widens_arrow_int_columns_when_needed(value, expected):
+    out = fill_missing(arrow_ints(), "a", "Static Value", value)
+
+    assert out["a"].tolist() == [10, 25, expected]
+    assert out["a"].dtype == "float64[pyarrow]"
+
+
+def test_static_whole_number_fill_keeps_the_int_dtype():
+    out = fill_missing(arrow_ints(), "a", "Static Value", "7")
+
+    assert out["a"].tolist() == [10, 25, 7]
+    assert out["a"].dtype == "int64[pyarrow]"
+
+
+def test_mean_fill_of_an_all_missing_column_is_a_no_op():
+    df = pd.DataFrame({"a": pd.array([None, None], dtype="int64[pyarrow]")})
+
+    assert fill_missing(df, "a", "Mean")["a"].isna().all()
@@ -1,4 +1,61 @@
+import os
 import pandas as pd
+from src.frame_utils import DTYPE_BACKEND, HAS_CALAMINE, has_undecoded_bytes
+
+# Optional: charset-normalizer sniffs the encoding so non-UTF-8 files are
+# parsed once instead of failing a full UTF-8 pass first
+try:
+    import charset_normalizer
+except ImportError:
+    charset_normalizer = None
+
+# Optional: psutil reports free memory for should_stream()
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+# Bytes of the file head handed to the encoding sniffer
+SNIFF_BYTES = 64 * 1024
+
+# Rows per chunk yielded by load_dataset_streaming()
+CHUNK_ROWS = 500_000
+
+
+def _looks_utf8(source):
+    """False only when the sniffer is confident the head is not UTF-8."""
+    if charset_normalizer is None:
+        return True
+    if hasattr(source, "read"):
+        head = source.read(SNIFF_BYTES)
+        source.seek(0)
+    else:
+        with open(source, "rb") as f:
+            head = f.read(SNIFF_BYTES)
+    if isinstance(head, str):
+        return True # Text buffer: already decoded
+    try:
+        head.decode("utf-8")
+        return True
+    except UnicodeDecodeError as e:
+        # A multi-byte character cut off at the end of the head is still UTF-8
+        if e.start >= len(head) - 3:
+            return True
+    best = charset_normalizer.from_bytes(head).best()
+    return best is not None and best.encoding in ("utf_8", "ascii")
+
+
+def _read_csv_fast(source, encoding):
+    """
+    Arrow's multithreaded parser. Returns None when it fails or, for invalid
+    UTF-8, hands back undecoded bytes instead of raising.
+    """
+    try:
+        df = pd.read_csv(source, engine="pyarrow", encoding=encoding, dtype_backend=DTYPE_BACKEND)
+    except Exception:
+        return None
+    return None if has_undecoded_bytes(df) else df
+
 
 def load_dataset(uploaded_file_or_path):
     """
@@ -14,16 +71,24 @@ def load_dataset(uploaded_file_or_path):
 
         # CSV loader with fallback encodings
         if filename.endswith(".csv"):
-            try:
-                df = pd.read_csv(uploaded_file_or_path, encoding="utf-8")
-            except UnicodeDecodeError:
+            encoding = "utf-8" if _looks_utf8(uploaded_file_or_path) else "latin-1"
+            df = _read_csv_fast(uploaded_file_or_path, encoding)
+            if df is None:
                 if hasattr(uploaded_file_or_path, "seek"):
                     uploaded_file_or_path.seek(0)
-                df = pd.read_csv(uploaded_file_or_path, encoding="latin-1")
+                try:
+                    df = pd.read_csv(uploaded_file_or_path, encoding=encoding, dtype_backend=DTYPE_BACKEND)
+                except UnicodeDecodeError:
+                    if hasattr(uploaded_file_or_path, "seek"):
+                        uploaded_file_or_path.seek(0)
+                    df = pd.read_csv(uploaded_file_or_path, encoding="latin-1", dtype_backend=DTYPE_BACKEND)
 
         # Excel loader
         elif filename.endswith((".xls", ".xlsx")):
-            df = pd.read_excel(uploaded_file_or_path)
+            if filename.endswith(".xlsx") and HAS_CALAMINE:
+                df = pd.read_excel(uploaded_file_or_path, engine="calamine", dtype_backend=DTYPE_BACKEND) # Rust reader
+            else:
+                df = pd.read_excel(uploaded_file_or_path, dtype_backend=DTYPE_BACKEND)
 
         else:
             raise ValueError("Unsupported file type. Please upload a CSV or Excel file.")
@@ -32,3 +97,25 @@ def load_dataset(uploaded_file_or_path):
 
     except Exception as e:
         raise RuntimeError(f"Error loading dataset: {e}")
+
+
+# --------------------------------------------------------------------
+# Streaming path for files that don't fit in memory
+# --------------------------------------------------------------------
+def should_stream(path):
+    """True when a CSV is larger than half the free RAM (False without psutil)."""
+    if psutil is None or not os.path.exists(path):
+        return False
+    return os.path.getsize(path) > 0.5 * psutil.virtual_memory().available
+
+
+def load_dataset_streaming(path, chunk_rows=CHUNK_ROWS):
+    """
+    Yields a CSV as DataFrames of up to chunk_rows rows, so peak memory is one
+    chunk instead of the whole file. Cells stay text (missing values are NaN):
+    inferring dtypes per chunk would type a column differently from one chunk
+    to the next. The encoding is sniffed from the head only, so bytes further
+    in that don't decode become U+FFFD instead of failing mid-stream.
+    """
+    encoding = "utf-8" if _looks_utf8(path) else "latin-1"
+    yield from pd.read_csv(path, chunksize=chunk_rows, encoding=encoding, encoding_errors="replace", dtype=str)
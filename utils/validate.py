@@ -1,5 +1,20 @@
 import pandas as pd
 import numpy as np
+from typing import TYPE_CHECKING
+from src.frame_utils import (
+    NUMERIC_KINDS, context_outlier_counts, count_duplicate_rows, iqr_outlier_counts,
+    numeric_text_ratio, partition_columns, row_hashes,
+)
+from src import fast_stats
+from src.fast_stats import map_columns
+from src.keywords import KeywordMatcher
+
+if TYPE_CHECKING:
+    from src.audit_context import AuditContext # Annotation only: that module needs Streamlit
+
+# Column-name keywords for classify_column (substring match, lowercase)
+TEMPORAL_KEYWORDS = KeywordMatcher(["date", "time", "year", "month"])
+PII_KEYWORDS = KeywordMatcher(["name", "email", "id", "phone", "address", "mobile", "user"])
 
 # --------------------------------------------------------------------
 # Column classification
@@ -8,35 +23,55 @@ def classify_column(col_name, series):
     """Classify a column as Numeric, Categorical, Temporal, or PII."""
     col_lower = col_name.lower()
 
-    # Temporal detection (by dtype or name keywords)
-    if np.issubdtype(series.dtype, np.datetime64) or any(k in col_lower for k in ["date", "time", "year", "month"]):
+    # Temporal detection (by dtype or name keywords); dtype.kind also covers Arrow types
+    if series.dtype.kind == "M" or TEMPORAL_KEYWORDS.matches(col_lower):
         return "Temporal"
 
     # PII detection (by column name keywords)
-    pii_keywords = ["name", "email", "id", "phone", "address", "mobile", "user"]
-    if any(k in col_lower for k in pii_keywords):
+    if PII_KEYWORDS.matches(col_lower):
         return "PII"
 
     # Numeric vs categorical
-    if np.issubdtype(series.dtype, np.number):
+    if series.dtype.kind in NUMERIC_KINDS:
         return "Numeric"
     return "Categorical"
 
 
+def has_mixed_types(series):
+    """True if the non-null values hold more than one kind of Python object."""
+    # infer_dtype scans in C; only an ambiguous "mixed" verdict (e.g. a column
+    # of lists) needs the per-cell type() pass
+    inferred = pd.api.types.infer_dtype(series, skipna=True)
+    if inferred == "mixed":
+        return series.dropna().map(type).nunique() > 1
+    return inferred.startswith("mixed")
+
+
+def _safe_numeric_text_ratio(series):
+    try:
+        return numeric_text_ratio(series)
+    except Exception:
+        return None
+
+
 # --------------------------------------------------------------------
 # Model-specific readiness evaluation
 # --------------------------------------------------------------------
-def evaluate_model_readiness(df, model_type):
+def evaluate_model_readiness(df, model_type, null_counts=None, partitions=None):
     """Compute readiness for specific ML model categories."""
-    numeric_ratio = len(df.select_dtypes(include=np.number).columns) / max(1, len(df.columns))
-    missing_ratio = df.isnull().mean().mean()
+    if partitions is None:
+        partitions = partition_columns(df)
+    numeric_ratio = len(partitions["numeric"]) / max(1, len(df.columns))
+    if null_counts is None:
+        null_counts = df.isnull().sum()
+    missing_ratio = (null_counts / len(df)).mean()
 
     if model_type == "Regression":
         score = round((0.6 * numeric_ratio + 0.4 * (1 - missing_ratio)), 2)
         note = "Regression models require mostly numeric and complete data."
 
     elif model_type == "Classification":
-        cat_ratio = len(df.select_dtypes(include=["object", "category"]).columns) / max(1, len(df.columns))
+        cat_ratio = len(partitions["text"] + partitions["category"]) / max(1, len(df.columns))
         score = round((0.5 * numeric_ratio + 0.3 * cat_ratio + 0.2 * (1 - missing_ratio)), 2)
         note = "Classification models need categorical balance and limited missing values."
 
@@ -61,7 +96,7 @@ def evaluate_model_readiness(df, model_type):
 # --------------------------------------------------------------------
 # Dashboard readiness evaluation
 # --------------------------------------------------------------------
-def evaluate_dashboard_readiness(df, classification_report):
+def evaluate_dashboard_readiness(df, classification_report, null_counts=None, dup_count=None, nunique=None):
     """
     Evaluate dashboard readiness based on:
     - Temporal consistency
@@ -78,18 +113,22 @@ def evaluate_dashboard_readiness(df, classification_report):
 
     # Temporal consistency
     if temporal_cols:
+        if null_counts is None:
+            null_counts = df[temporal_cols].isnull().sum()
         temporal_quality = 1
         for col in temporal_cols:
-            null_ratio = df[col].isnull().mean()
+            null_ratio = null_counts[col] / len(df)
             if null_ratio > 0.2:
                 temporal_quality = 0.5
         score += temporal_quality
 
     # Categorical diversity
     if cat_cols:
+        if nunique is None:
+            nunique = fast_stats.nunique(df[cat_cols], use_polars=False)
         diversity_scores = []
         for col in cat_cols:
-            unique_ratio = df[col].nunique() / len(df)
+            unique_ratio = nunique[col] / len(df)
             if 0.01 <= unique_ratio <= 0.5:
                 diversity_scores.append(1)
             elif unique_ratio < 0.01:
@@ -103,7 +142,9 @@ def evaluate_dashboard_readiness(df, classification_report):
     score += pii_penalty
 
     # Duplicates penalty
-    duplicate_ratio = df.duplicated().mean()
+    if dup_count is None:
+        dup_count = count_duplicate_rows(df)
+    duplicate_ratio = dup_count / max(1, len(df))
     duplicate_score = 1 - duplicate_ratio
     score += duplicate_score
 
@@ -128,18 +169,19 @@ def evaluate_dashboard_readiness(df, classification_report):
 # --------------------------------------------------------------------
 # Core audit function
 # --------------------------------------------------------------------
-def audit_dataset(df: pd.DataFrame):
-    """Comprehensive dataset audit."""
+def audit_dataset(df: pd.DataFrame, ctx: "AuditContext" = None):
+    """Comprehensive dataset audit. Pass ctx to reuse the shared per-frame panels."""
     report = {}
 
     # ---------------- BASIC STRUCTURE ----------------
     report["shape"] = df.shape
     report["columns"] = list(df.columns)
-    report["duplicates"] = int(df.duplicated().sum())
+    report["duplicates"] = int(ctx.dup_count if ctx is not None else count_duplicate_rows(df))
+    partitions = partition_columns(df) # Column groups by dtype, shared by the checks below
 
     # ---------------- MISSING VALUES ----------------
-    missing_count = df.isnull().sum()
-    missing_percent = (df.isnull().mean() * 100).round(2)
+    missing_count = ctx.null_counts if ctx is not None else df.isnull().sum()
+    missing_percent = (missing_count / len(df) * 100).round(2)
     report["missing_values"] = {
         col: {"count": int(missing_count[col]), "percent": float(missing_percent[col])}
         for col in df.columns
@@ -148,18 +190,22 @@ def audit_dataset(df: pd.DataFrame):
     # ---------------- DATA TYPES & CONFORMITY ----------------
     data_types = df.dtypes.astype(str).to_dict()
     conformity = {}
+    # The regex scans over text columns are the expensive part: run them up front, column-parallel
+    text_cols = [col for col, dtype in df.dtypes.items() if pd.api.types.is_string_dtype(dtype)]
+    text_ratios = dict(zip(text_cols, map_columns(_safe_numeric_text_ratio, df[text_cols])))
     for col, dtype in df.dtypes.items():
         try:
-            if dtype == object:
-                converted = pd.to_numeric(df[col], errors="coerce")
-                numeric_ratio = converted.notnull().mean()
-                if numeric_ratio > 0.9:
+            if col in text_ratios:
+                numeric_ratio = text_ratios[col]
+                if numeric_ratio is None:
+                    conformity[col] = "Could not evaluate"
+                elif numeric_ratio > 0.9:
                     conformity[col] = "Mostly numeric but stored as text"
                 else:
                     conformity[col] = "Categorical/Text"
-            elif np.issubdtype(dtype, np.number):
+            elif dtype.kind in NUMERIC_KINDS:
                 conformity[col] = "Numeric"
-            elif np.issubdtype(dtype, np.datetime64):
+            elif dtype.kind == "M":
                 conformity[col] = "Date/Time"
             else:
                 conformity[col] = "Other / Unsupported type"
@@ -181,25 +227,27 @@ def audit_dataset(df: pd.DataFrame):
     report["column_classification"] = classification_report
 
     # ---------------- OUTLIER DETECTION ----------------
-    numeric_cols = df.select_dtypes(include=np.number)
     outlier_summary = {}
-    for col in numeric_cols.columns:
-        q1, q3 = numeric_cols[col].quantile(0.25), numeric_cols[col].quantile(0.75)
-        iqr = q3 - q1
-        lower, upper = q1 - 1.5 * iqr, q3 + 1.5 * iqr
-        outliers = numeric_cols[(numeric_cols[col] < lower) | (numeric_cols[col] > upper)]
-        outlier_summary[col] = {"count": len(outliers), "percent": round((len(outliers) / len(df)) * 100, 2)}
+    if ctx is not None:
+        for col, count in context_outlier_counts(ctx).items():
+            outlier_summary[col] = {"count": int(count), "percent": round((count / len(df)) * 100, 2)}
+    else:
+        for col, count in iqr_outlier_counts(df[partitions["numeric"]]).items():
+            outlier_summary[col] = {"count": int(count), "percent": round((count / len(df)) * 100, 2)}
     report["outliers"] = outlier_summary
 
     # ---------------- ADDITIONAL QUALITY CHECKS ----------------
-    constant_cols = [col for col in df.columns if df[col].nunique(dropna=False) == 1]
+    # One batched distinct count; NaN counts as one more value with dropna=False
+    uniques = ctx.nunique if ctx is not None else fast_stats.nunique(df, use_polars=False)
+    uniques_with_na = uniques + (missing_count > 0)
+    constant_cols = [col for col in df.columns if uniques_with_na[col] == 1]
     high_cardinality = [
-        col for col in df.select_dtypes(include="object").columns
-        if df[col].nunique(dropna=False) > df.shape[0] * 0.5
+        col for col in partitions["text"]
+        if uniques_with_na[col] > df.shape[0] * 0.5
     ]
     mixed_type_cols = [
-        col for col in df.select_dtypes(include="object").columns
-        if df[col].dropna().map(type).nunique() > 1
+        col for col in partitions["text"]
+        if has_mixed_types(df[col])
     ]
     report["additional_quality_issues"] = {
         "constant_columns": constant_cols or ["None"],
@@ -225,9 +273,87 @@ def audit_dataset(df: pd.DataFrame):
 
     # ---------------- MODEL-SPECIFIC READINESS ----------------
     model_types = ["Regression", "Classification", "Clustering"]
-    report["model_readiness"] = {m: evaluate_model_readiness(df, m) for m in model_types}
+    report["model_readiness"] = {m: evaluate_model_readiness(df, m, missing_count, partitions) for m in model_types}
 
     # ---------------- DASHBOARD READINESS ----------------
-    report["dashboard_readiness"] = evaluate_dashboard_readiness(df, classification_report)
+    report["dashboard_readiness"] = evaluate_dashboard_readiness(
+        df, classification_report, missing_count, report["duplicates"], uniques
+    )
+
+    return report
+
+
+# --------------------------------------------------------------------
+# Streaming audit for files that don't fit in memory
+# --------------------------------------------------------------------
+# Values kept per numeric column to estimate quartiles (exact while a
+# column has no more non-null values than this)
+RESERVOIR_SIZE = 100_000
+
+
+def audit_streaming(chunks, reservoir_size=RESERVOIR_SIZE):
+    """
+    One-pass audit over text chunks from utils.load.load_dataset_streaming,
+    for CSVs too large to load whole (see should_stream there): shape,
+    duplicate rows, missing values and IQR outliers, in audit_dataset's report
+    format. Null counts are exact; duplicates are exact for rows that are
+    identical as text. A column counts as numeric while every non-null cell
+    parses as a number, as a full load would infer it. Quartiles come from a
+    uniform sample of reservoir_size values per numeric column, so outlier
+    counts are estimates once a column holds more non-null values than that.
+    """
+    rng = np.random.default_rng(0)
+    rows = 0
+    null_counts = None
+    numeric_cols = None # Taken from the first chunk, then only narrowed
+    unique_hashes = []
+    samples = {} # col -> (random keys, values); the smallest keys are kept
+
+    for chunk in chunks:
+        rows += len(chunk)
+        chunk_nulls = chunk.isna().sum()
+        null_counts = chunk_nulls if null_counts is None else null_counts + chunk_nulls
+        unique_hashes.append(pd.unique(row_hashes(chunk).to_numpy()))
+
+        if numeric_cols is None:
+            numeric_cols = list(chunk.columns)
+        for col in list(numeric_cols):
+            values = pd.to_numeric(chunk[col], errors="coerce").to_numpy(dtype=float, na_value=np.nan)
+            values = values[~np.isnan(values)]
+            if len(values) < len(chunk) - chunk_nulls[col]:
+                # Some text didn't parse: not a numeric column after all
+                numeric_cols.remove(col)
+                samples.pop(col, None)
+                continue
+            keys = rng.random(len(values))
+            if col in samples:
+                keys = np.concatenate([samples[col][0], keys])
+                values = np.concatenate([samples[col][1], values])
+            if len(values) > reservoir_size:
+                keep = np.argpartition(keys, reservoir_size)[:reservoir_size]
+                keys, values = keys[keep], values[keep]
+            samples[col] = (keys, values)
+
+    if null_counts is None:
+        raise RuntimeError("No rows to audit")
+
+    report = {"shape": (rows, len(null_counts))}
+    all_hashes = np.concatenate(unique_hashes)
+    report["duplicates"] = int(rows - len(np.unique(all_hashes)))
+    report["missing_values"] = {
+        col: {"count": int(count), "percent": round(count / rows * 100, 2)}
+        for col, count in null_counts.items()
+    }
+
+    outlier_summary = {}
+    for col, (_, values) in samples.items():
+        if len(values) == 0:
+            continue
+        q1, q3 = np.quantile(values, [0.25, 0.75])
+        iqr = q3 - q1
+        share = np.mean((values < q1 - 1.5 * iqr) | (values > q3 + 1.5 * iqr))
+        count = int(round(share * (rows - null_counts[col])))
+        outlier_summary[col] = {"count": count, "percent": round(count / rows * 100, 2)}
+    report["outliers"] = outlier_summary
 
     return report